@@ -0,0 +1,52 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled version of the per-edge loop of SimpleNNNetworkGraph._draw_edges.
+
+This module mirrors SimpleNNNetworkGraph._collect_edge_artists. It is
+optional and only used when it has been built with Cython.
+"""
+
+
+cpdef tuple collect_edge_artists(object ax, list edges, dict node_shape, double[:, ::1] coords):
+    """
+    Collect per-edge drawing properties and add the edge info labels.
+
+    Args:
+        ax (matplotlib.axes.Axes): The axes to draw on.
+        edges (list): ((u, v), _EdgeAttrs) pairs of the graph.
+        node_shape (dict): Node shapes keyed by node ID.
+        coords (numpy.ndarray): Start and end x and y coordinates of each edge, shape (N, 4).
+
+    Returns:
+        tuple: Edge colors, edge line styles, end points of gabaSyn edges
+        and their colors.
+    """
+    cdef Py_ssize_t i
+    cdef double start_x, start_y, end_x, end_y
+    cdef list colors = []
+    cdef list styles = []
+    cdef list gaba_ends = []
+    cdef list gaba_colors = []
+    cdef object key, d
+    # Bind the method once instead of looking it up for every label
+    cdef object text = ax.text
+
+    for i in range(len(edges)):
+        key, d = edges[i]
+        start_x = coords[i, 0]
+        start_y = coords[i, 1]
+        end_x = coords[i, 2]
+        end_y = coords[i, 3]
+
+        colors.append(d.color)
+        styles.append(d.style)
+
+        if d.synapse == 'gabaSyn':
+            gaba_ends.append((end_x, end_y))
+            gaba_colors.append(d.color)
+        # Check if the edge is not from an input node
+        if node_shape[key[0]] != 'h' and d.info:
+            text((start_x + end_x) / 2, (start_y + end_y) / 2, d.info,
+                 fontsize=20, ha='center', va='center', backgroundcolor='white')
+
+    return colors, styles, gaba_ends, gaba_colors
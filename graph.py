@@ -1,9 +1,166 @@
+import collections
+import functools
 import json
 import math
-import networkx as nx
-import matplotlib.pyplot as plt
-from matplotlib.colors import to_rgba
-from matplotlib.patches import RegularPolygon
+import os
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; large files are then parsed in one go
+    ijson = None
+
+try:
+    from nn_graph._draw import collect_edge_artists
+except ImportError:  # the compiled edge loop is optional; fall back to pure Python
+    collect_edge_artists = None
+
+# Model files larger than this are streamed with ijson when it is available.
+# Streaming trades load time for memory: the file is scanned once, or twice
+# when projections precede the other sections, which can be up to about 2x
+# slower than orjson, while peak memory stays roughly flat.
+_STREAMING_THRESHOLD = 50 * 1024 * 1024
+
+# Node and edge attributes are stored as plain tuples
+_NodeAttrs = collections.namedtuple('_NodeAttrs', ['color', 'shape', 'size'])
+_EdgeAttrs = collections.namedtuple('_EdgeAttrs', ['synapse', 'style', 'arrowstyle', 'color', 'info', 'synapse_category'])
+
+# Arrow style, color and category of edges by synapse type. A color of None
+# means the edge takes the color of its presynaptic population.
+_SYN_TABLE = {
+    'ampaSyn': ('-|>', 'blue', 'excitatory'),
+    'gabaSyn': (None, 'red', 'inhibitory'),
+}
+_GENERIC_SYN = ('->', None, 'generic')
+
+
+class _StreamedSection:
+    """
+    Read-only view of one JSON object in a model file, streamed with ijson.
+
+    Every iteration re-reads the file, so only one entry of the object is held
+    in memory at a time.
+
+    Attributes:
+        file_path (str): Path to the JSON file.
+        prefix (str): ijson prefix of the object, e.g. 'network_id.projections'.
+    """
+
+    __slots__ = ('file_path', 'prefix')
+
+    def __init__(self, file_path, prefix):
+        self.file_path = file_path
+        self.prefix = prefix
+
+    def items(self):
+        with open(self.file_path, 'rb') as f:
+            yield from ijson.kvitems(f, self.prefix, use_float=True)
+
+    def values(self):
+        for _, value in self.items():
+            yield value
+
+
+class _Graph:
+    """
+    Minimal directed graph holding the nodes and edges of a network.
+
+    Attributes:
+        nodes (dict): Node attributes keyed by node ID, in insertion order.
+        edges (dict): Edge attributes keyed by (u, v), in insertion order.
+    """
+
+    __slots__ = ('nodes', 'edges')
+
+    def __init__(self, nodes, edges):
+        self.nodes = nodes
+        self.edges = edges
+
+
+def _edge_coords(starts, ends, start_sizes, end_sizes, out):
+    """
+    Fill out with the start and end coordinates of each edge, shortened to
+    the boundary of its nodes.
+
+    This is the loop compiled by _get_edge_coords_kernel.
+
+    Args:
+        starts (numpy.ndarray): Start node positions, shape (N, 2).
+        ends (numpy.ndarray): End node positions, shape (N, 2).
+        start_sizes (numpy.ndarray): Sizes of the start nodes, shape (N,).
+        end_sizes (numpy.ndarray): Sizes of the end nodes, shape (N,).
+        out (numpy.ndarray): Output array of shape (N, 4).
+    """
+    for i in range(starts.shape[0]):
+        dx = ends[i, 0] - starts[i, 0]
+        dy = ends[i, 1] - starts[i, 1]
+        length = math.sqrt(dx * dx + dy * dy)
+        dx /= length
+        dy /= length
+        out[i, 0] = starts[i, 0] + dx * start_sizes[i] / 2
+        out[i, 1] = starts[i, 1] + dy * start_sizes[i] / 2
+        out[i, 2] = ends[i, 0] - dx * end_sizes[i] / 2
+        out[i, 3] = ends[i, 1] - dy * end_sizes[i] / 2
+
+
+# numba-compiled _edge_coords, resolved on first use: None until then and
+# False when numba is not installed
+_edge_coords_kernel = None
+
+# Importing numba and loading the cached kernel costs about 0.4 s per process,
+# while the kernel saves about 0.1 us per edge over NumPy, so it only pays off
+# on graphs with millions of edges
+_NUMBA_MIN_EDGES = 5_000_000
+
+
+def _get_edge_coords_kernel():
+    """
+    Get the numba-compiled version of _edge_coords.
+
+    numba is imported and the kernel compiled lazily, so that loading a model
+    without drawing it does not pay numba's import cost. Even with a warm
+    on-disk cache, the import and the first call cost about 0.3-0.4 s per
+    process, so callers should only use the kernel on very large graphs.
+
+    Returns:
+        callable or bool: The compiled kernel, or False if numba is not installed.
+    """
+    global _edge_coords_kernel
+    if _edge_coords_kernel is None:
+        try:
+            from numba import njit
+        except ImportError:  # numba is optional; fall back to the NumPy implementation
+            _edge_coords_kernel = False
+        else:
+            # error_model='numpy' keeps the NumPy behaviour for zero-length edges
+            _edge_coords_kernel = njit(cache=True, error_model='numpy')(_edge_coords)
+    return _edge_coords_kernel
+
+
+@functools.lru_cache(maxsize=None)
+def _convert_color(color_str):
+    """
+    Convert a color string to RGBA format.
+
+    Results are memoized, since the same color string is typically shared by
+    a population node and every projection leaving it.
+
+    Args:
+        color_str (str): Color string in format "r g b" or "r g b a".
+
+    Returns:
+        tuple: RGBA color tuple, with each component clamped to [0, 1].
+    """
+    vals = color_str.split()
+    r, g, b = float(vals[0]), float(vals[1]), float(vals[2])
+    a = float(vals[3]) if len(vals) == 4 else 1.0
+    return tuple(min(max(c, 0.0), 1.0) for c in (r, g, b, a))
+
 
 class SimpleNNNetworkGraph:
     """
@@ -11,9 +168,13 @@ class SimpleNNNetworkGraph:
 
     This class reads a JSON file containing a neural network model description,
     creates a graph representation of the network, and provides methods to visualize it.
+
+    Note that for model files streamed with ijson (see _STREAMING_THRESHOLD),
+    the 'projections' entry of network_data is a read-only _StreamedSection
+    offering items() and values(), not a dict.
     """
 
-    def __init__(self, file_path, base_node_size=0.5, edge_width=2, mutation_scale=15, show_info=False, fig_size=(14, 10), file_format='png'):
+    def __init__(self, file_path, base_node_size=0.5, edge_width=2, mutation_scale=15, show_info=False, fig_size=(14, 10), file_format='png', dpi=100):
         """
         Initialize the SimpleNNNetworkGraph object.
 
@@ -25,6 +186,7 @@ class SimpleNNNetworkGraph:
             show_info (bool): Whether to show additional info on edges. Default is False.
             fig_size (tuple): Size of the figure for plotting. Default is (14, 10).
             file_format (str): Format for saving the graph image. Default is 'png'.
+            dpi (int): Resolution of the figure in dots per inch. Default is 100.
         """
         self.file_path = file_path
         self.base_node_size = base_node_size
@@ -33,44 +195,121 @@ class SimpleNNNetworkGraph:
         self.show_info = show_info
         self.fig_size = fig_size
         self.file_format = file_format
+        self.dpi = dpi
         self.network_data = self._load_network_data()
         self.G = self._create_graph()
 
-    def _convert_color(self, color_str):
+    def _load_network_data(self):
         """
-        Convert a color string to RGBA format.
+        Load the network model from the JSON file.
 
-        Args:
-            color_str (str): Color string in format "r g b" or "r g b a".
+        The file is read as raw bytes and parsed with orjson when it is
+        available, falling back to the standard library json module. Files
+        above _STREAMING_THRESHOLD are streamed instead when ijson is installed.
 
         Returns:
-            tuple: RGBA color tuple.
+            dict: Parsed network model.
         """
-        color_tuple = tuple(map(float, color_str.split()))
-        return to_rgba(color_tuple)
+        if ijson is not None and os.path.getsize(self.file_path) > _STREAMING_THRESHOLD:
+            return self._stream_network_data()
 
-    def _load_network_data(self):
-        with open(self.file_path, 'r', encoding='utf-8') as f:
+        with open(self.file_path, 'rb') as f:
             content = f.read()
+        if orjson is not None:
+            try:
+                return orjson.loads(content)
+            except orjson.JSONDecodeError as e:
+                self._report_decode_error(e, content)
+                raise
         try:
             return json.loads(content)
         except json.JSONDecodeError as e:
-            print(f"JSON Decode Error at position {e.pos}: {e.msg}")
-            print(f"Problematic content: {content[max(0, e.pos-20):e.pos+20]}")
+            self._report_decode_error(e, content)
             raise
-        
 
+    def _stream_network_data(self):
+        """
+        Load the first network of the JSON file without materializing the whole file.
+
+        Populations, inputs and input sources are read into memory, while the
+        projections, which dominate the size of large models, are kept as a
+        streamed section that is parsed one projection at a time.
+
+        Returns:
+            dict: Network model with a single network.
+        """
+        network_id, network = self._read_small_sections(('populations', 'inputs', 'input_sources'),
+                                                        streamed=('projections',))
+        return {network_id: network}
+
+    def _read_small_sections(self, sections, streamed=()):
+        """
+        Read the ID and the given sections of the first network in a single pass.
+
+        The parse stops as soon as all sections have been found or the first
+        network ends; other sections are skipped without being materialized.
+        As in the in-memory path, sections missing from the file are missing
+        from the result.
+
+        Args:
+            sections (tuple): Names of the sections to read into memory.
+            streamed (tuple): Names of the sections to return as _StreamedSection
+                instead of reading them.
+
+        Returns:
+            tuple: Network ID and a dict of the sections found in the file.
+        """
+        network = {}
+        network_id = None
+        wanted = {}
+        pending = set(streamed)
+        builder = None
+        building = None
+        with open(self.file_path, 'rb') as f:
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if builder is not None:
+                    builder.event(event, value)
+                    if prefix == building and event == 'end_map':
+                        network[wanted.pop(building)] = builder.value
+                        builder = None
+                        if not wanted and not pending:
+                            break
+                elif prefix == '' and event == 'map_key':
+                    if network_id is not None:
+                        break  # only the first network is used
+                    network_id = value
+                    wanted = {f"{network_id}.{section}": section for section in sections}
+                elif prefix == network_id and event == 'map_key' and value in pending:
+                    pending.remove(value)
+                    network[value] = _StreamedSection(self.file_path, f"{network_id}.{value}")
+                    if not wanted and not pending:
+                        break
+                elif prefix in wanted and event == 'start_map':
+                    building = prefix
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+        return network_id, network
+
+    def _report_decode_error(self, error, content):
+        """
+        Print the location and surrounding content of a JSON decode error.
+
+        Args:
+            error (json.JSONDecodeError): The decode error raised by the parser.
+            content (bytes): Raw file content that failed to parse.
+        """
+        print(f"JSON Decode Error at position {error.pos}: {error.msg}")
+        print(f"Problematic content: {content[max(0, error.pos-20):error.pos+20].decode('utf-8', errors='replace')}")
 
     def _create_graph(self):
         """
-        Create a NetworkX graph representation of the neural network.
+        Create a graph representation of the neural network.
 
         Returns:
-            networkx.DiGraph: Directed graph representation of the network.
+            _Graph: Directed graph representation of the network.
         """
         network_id = list(self.network_data.keys())[0]
         network = self.network_data[network_id]
-        G = nx.DiGraph()
 
         node_shapes = {
         'excitatory': '^',
@@ -79,97 +318,94 @@ class SimpleNNNetworkGraph:
         'input': 'h'
         }
 
+        nodes = {}
+        edges = {}
+        # Node sizes are fixed once the graph is built, so track the largest here
+        max_size = 0
+
         # Add population nodes with default shape
         for pop_id, pop in network['populations'].items():
-            G.add_node(pop_id, color=self._convert_color(pop['properties']['color']),
-                   shape=node_shapes['generic'], size=pop['size'])
+            nodes[pop_id] = _NodeAttrs(color=_convert_color(pop['properties']['color']),
+                                       shape=node_shapes['generic'], size=pop['size'])
+            max_size = max(max_size, pop['size'])
+
+        # RGBA colors of the populations, looked up by generic projections
+        pop_rgba = {pop_id: attrs.color for pop_id, attrs in nodes.items()}
     
         # Initialize synapse types tracking for nodes
-        node_synapse_types = {node: set() for node in G.nodes}
+        node_synapse_types = {node: set() for node in nodes}
 
         # Add input source nodes and edges
         if 'inputs' in network and network['inputs']:
             for input_id, input_info in network['inputs'].items():
-                G.add_node(input_id, color=self._convert_color("1 1 0"), 
-                       shape=node_shapes['input'], size=2)  # Yellow for input sources
+                nodes[input_id] = _NodeAttrs(color=_convert_color("1 1 0"),
+                                             shape=node_shapes['input'], size=2)  # Yellow for input sources
+                max_size = max(max_size, 2)
                 # There is no information about size in inputs section
                 # Add edges for inputs
-                self._add_input_edge(G, input_id, input_info, network['input_sources'])
+                self._add_input_edge(edges, input_id, input_info, network['input_sources'])
                 node_synapse_types[input_id] = 'dummy'  # Mark input node
 
             # Update node shapes based on their synapse types
-            self._update_node_shapes(G, node_synapse_types, node_shapes)
+            self._update_node_shapes(nodes, node_synapse_types, node_shapes)
 
         # Add edges and determine node types based on projections
         for proj in network['projections'].values():
-            self._add_projection(G, proj, node_synapse_types, node_shapes, network)
+            self._add_projection(edges, proj, node_synapse_types, node_shapes, pop_rgba)
 
-        return G
+        # Flat shape lookup for the per-edge drawing loop
+        self._node_shape = {node: attrs.shape for node, attrs in nodes.items()}
+        self._max_size = max_size
 
+        return _Graph(nodes, edges)
 
-    def _add_projection(self, G, proj, node_synapse_types, node_shapes, network):
+
+    def _add_projection(self, edges, proj, node_synapse_types, node_shapes, pop_rgba):
         """
-        Add a projection (edge) to the graph and update node synapse types.
+        Add a projection (edge) to the edge table and update node synapse types.
 
         Args:
-            G (networkx.DiGraph): The graph to update.
+            edges (dict): Edge attributes keyed by (u, v), to add the edge to.
             proj (dict): Projection information.
             node_synapse_types (dict): Dictionary to track node synapse types.
             node_shapes (dict): Dictionary of node shapes.
+            pop_rgba (dict): RGBA colors of the populations.
         """
         pre_pop = proj['presynaptic']
         post_pop = proj['postsynaptic']
         synapse_type = proj.get('synapse', 'generic')
         style = 'dashed' if proj.get('random_connectivity', {}).get('probability', 1) < 1 else 'solid'
-        edge_attrs = self._get_edge_attributes(synapse_type, proj,style, network)
-        node_synapse_types[pre_pop].add(edge_attrs['synapse_category'])
+        edge_attrs = self._get_edge_attributes(synapse_type, proj, style, pop_rgba)
+        node_synapse_types[pre_pop].add(edge_attrs.synapse_category)
 
+        edges[(pre_pop, post_pop)] = edge_attrs
         if proj.get('directionality') == 'bidirectional':
-            G.add_edge(pre_pop, post_pop, **edge_attrs)
-            G.add_edge(post_pop, pre_pop, **edge_attrs)
-        else:
-            G.add_edge(pre_pop, post_pop, **edge_attrs)
+            edges[(post_pop, pre_pop)] = edge_attrs
 
-    def _get_edge_attributes(self, synapse_type, proj, style, network):
+    def _get_edge_attributes(self, synapse_type, proj, style, pop_rgba):
         """
         Get edge attributes based on synapse type and projection properties.
 
         Args:
             synapse_type (str): Type of synapse.
             proj (dict): Projection information.
+            style (str): Line style of the edge.
+            pop_rgba (dict): RGBA colors of the populations.
 
         Returns:
-            dict: Edge attributes.
-        """
-        if synapse_type == 'ampaSyn':
-            return {
-                'synapse': proj['synapse'],
-                'style': style,
-                'arrowstyle': '-|>',
-                'color': 'blue',
-                'info': self._format_edge_info(proj),
-                'synapse_category': 'excitatory'
-            }
-        elif synapse_type == 'gabaSyn':
-            return {
-                'synapse': proj['synapse'],
-                'style': style,
-                'arrowstyle': None,
-                'color': 'red',
-                'info': self._format_edge_info(proj),
-                'synapse_category': 'inhibitory'
-            }
-        else:
-            
-            return {
-                'synapse': proj['synapse'],
-                'style': style,
-                'arrowstyle': '->',
-                'color': self._convert_color(network['populations'][proj['presynaptic']]['properties']['color']),
-                'info': self._format_edge_info(proj),
-                'synapse_category': 'generic'
-            }
-
+            _EdgeAttrs: Edge attributes.
+        """
+        arrowstyle, color, category = _SYN_TABLE.get(synapse_type, _GENERIC_SYN)
+        if color is None:
+            color = pop_rgba[proj['presynaptic']]
+        return _EdgeAttrs(
+            synapse=proj['synapse'],
+            style=style,
+            arrowstyle=arrowstyle,
+            color=color,
+            info=self._format_edge_info(proj),
+            synapse_category=category
+        )
 
     def _format_edge_info(self, proj):
         """
@@ -191,12 +427,12 @@ class SimpleNNNetworkGraph:
             return f"Delay: {delay}"
         return ""
 
-    def _add_input_edge(self, G, input_id, input_info, input_sources):
+    def _add_input_edge(self, edges, input_id, input_info, input_sources):
         """
-        Add an input edge to the graph.
+        Add an input edge to the edge table.
 
         Args:
-            G (networkx.DiGraph): The graph to update.
+            edges (dict): Edge attributes keyed by (u, v), to add the edge to.
             input_id (str): ID of the input node.
             input_info (dict): Input information.
             input_sources (dict): Dictionary of input sources.
@@ -205,32 +441,44 @@ class SimpleNNNetworkGraph:
         #input_params = input_sources[input_info['input_source']]['parameters']
         
         
-        G.add_edge(input_id, target_pop, synapse='input', style='solid', arrowstyle='->', color='yellow')
+        edges[(input_id, target_pop)] = _EdgeAttrs(synapse='input', style='solid', arrowstyle='->', color='yellow',
+                                                   info='', synapse_category=None)
 
-    def _update_node_shapes(self, G, node_synapse_types, node_shapes):
+    def _update_node_shapes(self, nodes, node_synapse_types, node_shapes):
         """
         Update node shapes based on their synapse types.
 
         Args:
-            G (networkx.DiGraph): The graph to update.
+            nodes (dict): Node attributes keyed by node ID.
             node_synapse_types (dict): Dictionary of node synapse types.
             node_shapes (dict): Dictionary of node shapes.
         """
-        # Update node shapes based on their synapse types
-        for node, synapse_types in node_synapse_types.items():
-            if 'excitatory' in synapse_types and 'inhibitory' in synapse_types:
-                G.nodes[node]['shape'] = node_shapes['generic']
-            elif 'excitatory' in synapse_types:
-                G.nodes[node]['shape'] = node_shapes['excitatory']
-                G.nodes[node]['color'] = 'blue'
-            elif 'inhibitory' in synapse_types:
-                G.nodes[node]['shape'] = node_shapes['inhibitory']
-                G.nodes[node]['color'] = 'red'
-            elif 'dummy' in synapse_types:
-                print(G.nodes[node])
-                G.nodes[node]['shape'] = node_shapes['input']
-            else:
-                G.nodes[node]['shape'] = node_shapes['generic']
+        # Compute all updated attributes first, then commit them in one go
+        nodes.update({
+            node: nodes[node]._replace(**self._get_node_style(synapse_types, node_shapes))
+            for node, synapse_types in node_synapse_types.items()
+        })
+
+    def _get_node_style(self, synapse_types, node_shapes):
+        """
+        Get the shape, and color where it changes, of a node from its synapse types.
+
+        Args:
+            synapse_types (set or str): Synapse categories of the node, or 'dummy' for input nodes.
+            node_shapes (dict): Dictionary of node shapes.
+
+        Returns:
+            dict: Node attributes to replace.
+        """
+        if 'excitatory' in synapse_types and 'inhibitory' in synapse_types:
+            return {'shape': node_shapes['generic']}
+        elif 'excitatory' in synapse_types:
+            return {'shape': node_shapes['excitatory'], 'color': 'blue'}
+        elif 'inhibitory' in synapse_types:
+            return {'shape': node_shapes['inhibitory'], 'color': 'red'}
+        elif 'dummy' in synapse_types:
+            return {'shape': node_shapes['input']}
+        return {'shape': node_shapes['generic']}
 
     def set_node_positions(self):
         """
@@ -239,31 +487,66 @@ class SimpleNNNetworkGraph:
         Returns:
             dict: Node positions.
         """
-        pos = {}
-        nodes = list(self.G.nodes())
-        for i, node in enumerate(nodes):
-            angle = 2 * math.pi * i / len(nodes)
-            x = math.cos(angle)
-            y = math.sin(angle)
-            pos[node] = (x, y)
-        return pos
+        nodes = list(self.G.nodes)
+        angles = np.linspace(0, 2 * np.pi, len(nodes), endpoint=False)
+        return dict(zip(nodes, zip(np.cos(angles).tolist(), np.sin(angles).tolist())))
 
     def draw_graph(self):
         """
         Draw the neural network graph.
         """
+        # matplotlib is only imported when drawing, so building the graph stays cheap
+        import matplotlib.pyplot as plt
+
+        fig = plt.figure(figsize=self.fig_size, dpi=self.dpi)
+        self._draw_figure(fig)
+        plt.show()
+
+    def render(self, path=None):
+        """
+        Render the neural network graph to an image file without displaying it.
+
+        The figure is drawn on a non-interactive Agg canvas, so no GUI backend
+        is needed and pyplot's global state is left untouched.
+
+        Args:
+            path (str): Output file path. Default is 'graph.<file_format>'.
+
+        Returns:
+            str: Path of the written image.
+        """
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        if path is None:
+            path = f"graph.{self.file_format}"
+        fig = Figure(figsize=self.fig_size, dpi=self.dpi)
+        FigureCanvasAgg(fig)
+        self._draw_figure(fig)
+        fig.savefig(path, dpi=self.dpi, bbox_inches='tight')
+        return path
+
+    def _draw_figure(self, fig):
+        """
+        Draw the neural network graph into a figure.
+
+        Args:
+            fig (matplotlib.figure.Figure): The figure to draw on.
+        """
         pos = self.set_node_positions()
-        fig, ax = plt.subplots(figsize=self.fig_size)
+        # The axes are hidden, so skip the frame and tick machinery up front
+        ax = fig.add_axes([0, 0, 1, 1], frameon=False)
+        ax.set_xticks([])
+        ax.set_yticks([])
         
-        max_size = max(data['size'] for _, data in self.G.nodes(data=True))
+        max_size = self._max_size
         scaled_sizes = {}
         
         self._draw_nodes(ax, pos, max_size, scaled_sizes)
         self._draw_edges(ax, pos, scaled_sizes)
 
-        plt.axis('equal')
-        plt.axis('off')
-        plt.show()
+        ax.axis('equal')
+        ax.axis('off')
 
     def _draw_nodes(self, ax, pos, max_size, scaled_sizes):
         """
@@ -275,25 +558,30 @@ class SimpleNNNetworkGraph:
             max_size (float): Maximum node size.
             scaled_sizes (dict): Dictionary to store scaled node sizes.
         """
+        from matplotlib.collections import PatchCollection
+        from matplotlib.patches import Circle, Polygon, Rectangle, RegularPolygon
+
+        patches = []
         for node, (x, y) in pos.items():
-            shape = self.G.nodes[node]['shape']
-            color = self.G.nodes[node]['color']
-            size = self.G.nodes[node]['size']
+            color, shape, size = self.G.nodes[node]
             
             scaled_size = self.base_node_size * (size / max_size)
             scaled_sizes[node] = scaled_size
             
             if shape == 's':
-                ax.add_patch(plt.Rectangle((x - scaled_size/2, y - scaled_size/2), scaled_size, scaled_size, fill=False, edgecolor=color, linewidth=4))
+                patches.append(Rectangle((x - scaled_size/2, y - scaled_size/2), scaled_size, scaled_size, fill=False, edgecolor=color, linewidth=4))
             elif shape == 'o':
-                ax.add_patch(plt.Circle((x, y), scaled_size/2, fill=False, edgecolor=color, linewidth=4))
+                patches.append(Circle((x, y), scaled_size/2, fill=False, edgecolor=color, linewidth=4))
             elif shape == '^':
-                ax.add_patch(plt.Polygon([(x, y + scaled_size/2), (x - scaled_size/2, y - scaled_size/2), (x + scaled_size/2, y - scaled_size/2)], fill=False, edgecolor=color, linewidth=4))
+                patches.append(Polygon([(x, y + scaled_size/2), (x - scaled_size/2, y - scaled_size/2), (x + scaled_size/2, y - scaled_size/2)], fill=False, edgecolor=color, linewidth=4))
             elif shape == 'h':
-                ax.add_patch(RegularPolygon((x, y), numVertices=6, radius=scaled_size/2, fill=False, edgecolor=color, linewidth=4))
+                patches.append(RegularPolygon((x, y), numVertices=6, radius=scaled_size/2, fill=False, edgecolor=color, linewidth=4))
             
             ax.text(x, y, node, ha='center', va='center', fontweight='bold')
 
+        # All node shapes are drawn as a single artist, keeping their own colors
+        ax.add_collection(PatchCollection(patches, match_original=True))
+
     def _draw_edges(self, ax, pos, scaled_sizes):
         """
         Draw edges on the graph.
@@ -303,55 +591,127 @@ class SimpleNNNetworkGraph:
             pos (dict): Node positions.
             scaled_sizes (dict): Dictionary of scaled node sizes.
         """
-        for u, v, d in self.G.edges(data=True):
-            start = pos[u]
-            end = pos[v]
-            color = d['color']
-            
-            start_x, start_y, end_x, end_y = self._calculate_edge_coordinates(start, end, scaled_sizes[u], scaled_sizes[v])
-            
-            if d['style'] == 'dashed':
-                ax.annotate("", xy=(end_x, end_y), xytext=(start_x, start_y),
-                            arrowprops=dict(arrowstyle="->", color=color, lw=self.edge_width, linestyle="--", mutation_scale=self.mutation_scale))
-            else:
-                ax.annotate("", xy=(end_x, end_y), xytext=(start_x, start_y),
-                            arrowprops=dict(arrowstyle="->", color=color, lw=self.edge_width, mutation_scale=self.mutation_scale))
+        from matplotlib.collections import LineCollection, PathCollection
+        from matplotlib.path import Path
+        from matplotlib.transforms import Affine2D
+
+        edges = list(self.G.edges)
+        starts = np.array([pos[u] for u, _ in edges], dtype=float).reshape(-1, 2)
+        ends = np.array([pos[v] for _, v in edges], dtype=float).reshape(-1, 2)
+        start_sizes = np.array([scaled_sizes[u] for u, _ in edges], dtype=float)
+        end_sizes = np.array([scaled_sizes[v] for _, v in edges], dtype=float)
+        coords = self._calculate_edge_coordinates(starts, ends, start_sizes, end_sizes)
+
+        if collect_edge_artists is not None:
+            colors, styles, gaba_ends, gaba_colors = collect_edge_artists(
+                ax, list(self.G.edges.items()), self._node_shape, coords)
+        else:
+            colors, styles, gaba_ends, gaba_colors = self._collect_edge_artists(ax, coords)
+
+        # All edge shafts are drawn as a single artist
+        ax.add_collection(LineCollection(coords.reshape(-1, 2, 2), colors=colors, linestyles=styles,
+                                         linewidths=self.edge_width))
+
+        # Arrowheads follow matplotlib's "->" style. Like scatter markers, they are
+        # defined in points and placed at the edge tips, so they keep their size
+        # when the figure is resized or zoomed.
+        heads = self._calculate_arrowhead_vertices(coords, 0.4 * self.mutation_scale, 0.2 * self.mutation_scale)
+        codes = [Path.MOVETO, Path.LINETO, Path.LINETO]
+        ax.add_collection(PathCollection([Path(vertices, codes) for vertices in heads],
+                                         offsets=coords[:, 2:], offset_transform=ax.transData,
+                                         transform=Affine2D().scale(1 / 72) + ax.figure.dpi_scale_trans,
+                                         facecolors='none', edgecolors=colors, linestyles=styles,
+                                         linewidths=self.edge_width, zorder=2),
+                          autolim=False)
+
+        if gaba_ends:
+            gaba_x, gaba_y = zip(*gaba_ends)
+            ax.scatter(gaba_x, gaba_y, s=(self.edge_width * 10) ** 2, color=gaba_colors, zorder=2)
+
+    def _collect_edge_artists(self, ax, coords):
+        """
+        Collect per-edge drawing properties and add the edge info labels.
+
+        nn_graph._draw.collect_edge_artists is a compiled version of this loop
+        and is used instead when it has been built.
+
+        Args:
+            ax (matplotlib.axes.Axes): The axes to draw on.
+            coords (numpy.ndarray): Start and end x and y coordinates of each edge, shape (N, 4).
+
+        Returns:
+            tuple: Edge colors, edge line styles, end points of gabaSyn edges
+            and their colors.
+        """
+        colors = []
+        styles = []
+        gaba_ends = []
+        gaba_colors = []
+        for ((u, v), d), (start_x, start_y, end_x, end_y) in zip(self.G.edges.items(), coords.tolist()):
+            colors.append(d.color)
+            styles.append(d.style)
             
-            if d['synapse'] == 'gabaSyn':
-                ax.plot(end_x, end_y, 'o', color=color, markersize=self.edge_width * 10)
+            if d.synapse == 'gabaSyn':
+                gaba_ends.append((end_x, end_y))
+                gaba_colors.append(d.color)
             # Check if the edge is not from an input node
-            if self.G.nodes[u]['shape'] != 'h' and d['info']:
-                try:
-                    info = d.get('info', '')
-                    if info:
-                        mid_x, mid_y = (start_x + end_x) / 2, (start_y + end_y) / 2
+            if self._node_shape[u] != 'h' and d.info:
+                mid_x, mid_y = (start_x + end_x) / 2, (start_y + end_y) / 2
 
-                        ax.text(mid_x, mid_y, info, fontsize=20, ha='center', va='center', backgroundcolor='white')
-                except KeyError:
-                    # If there's any issue with accessing node or edge properties, we skip adding the text
-                    pass
-    def _calculate_edge_coordinates(self, start, end, start_size, end_size):
+                ax.text(mid_x, mid_y, d.info, fontsize=20, ha='center', va='center', backgroundcolor='white')
+
+        return colors, styles, gaba_ends, gaba_colors
+
+    def _calculate_arrowhead_vertices(self, coords, head_length, head_width):
         """
-        Calculate the start and end coordinates for an edge.
+        Calculate the vertices of an open arrowhead at the end of each edge.
 
         Args:
-            start (tuple): Start node position.
-            end (tuple): End node position.
-            start_size (float): Size of the start node.
-            end_size (float): Size of the end node.
+            coords (numpy.ndarray): Start and end x and y coordinates of each edge, shape (N, 4).
+            head_length (float): Length of the arrowhead along the edge, in points.
+            head_width (float): Half-width of the arrowhead, in points.
 
         Returns:
-            tuple: Start and end x and y coordinates for the edge.
+            numpy.ndarray: Vertices of each arrowhead in points relative to the edge
+            tip, shape (N, 3, 2), ordered left back corner, tip, right back corner.
         """
-        dx = end[0] - start[0]
-        dy = end[1] - start[1]
-        length = math.sqrt(dx**2 + dy**2)
-        dx, dy = dx / length, dy / length
-        
-        start_x = start[0] + dx * start_size / 2
-        start_y = start[1] + dy * start_size / 2
-        end_x = end[0] - dx * end_size / 2
-        end_y = end[1] - dy * end_size / 2
-        
-        return start_x, start_y, end_x, end_y
+        d = coords[:, 2:] - coords[:, :2]
+        d /= np.hypot(d[:, 0], d[:, 1])[:, None]
+        normal = np.column_stack((-d[:, 1], d[:, 0]))
+
+        back = -d * head_length
+        tips = np.zeros_like(d)
+        return np.stack((back + normal * head_width, tips, back - normal * head_width), axis=1)
+
+    def _calculate_edge_coordinates(self, starts, ends, start_sizes, end_sizes):
+        """
+        Calculate the start and end coordinates for a batch of edges.
+
+        Each edge is shortened so that it starts and ends on the boundary of
+        its nodes rather than at their centers. The numba kernel is used for
+        graphs with at least _NUMBA_MIN_EDGES edges when numba is installed;
+        otherwise the computation is done with NumPy.
+
+        Args:
+            starts (numpy.ndarray): Start node positions, shape (N, 2).
+            ends (numpy.ndarray): End node positions, shape (N, 2).
+            start_sizes (numpy.ndarray): Sizes of the start nodes, shape (N,).
+            end_sizes (numpy.ndarray): Sizes of the end nodes, shape (N,).
+
+        Returns:
+            numpy.ndarray: Start and end x and y coordinates of each edge, shape (N, 4).
+        """
+        kernel = starts.shape[0] >= _NUMBA_MIN_EDGES and _get_edge_coords_kernel()
+        if kernel:
+            out = np.empty((starts.shape[0], 4))
+            kernel(starts, ends, start_sizes, end_sizes, out)
+            return out
+
+        d = ends - starts
+        length = np.hypot(d[:, 0], d[:, 1])
+        d /= length[:, None]
+
+        edge_starts = starts + d * (start_sizes[:, None] / 2)
+        edge_ends = ends - d * (end_sizes[:, None] / 2)
 
+        return np.hstack((edge_starts, edge_ends))
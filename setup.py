@@ -1,4 +1,12 @@
-from setuptools import setup, find_packages
+from setuptools import setup, Extension
+
+try:
+    from Cython.Build import cythonize
+except ImportError:  # the compiled edge loop is optional
+    ext_modules = []
+else:
+    ext_modules = cythonize([Extension("nn_graph._draw", ["_draw.pyx"])],
+                            compiler_directives={'language_level': 3})
 
 with open('README.md', 'r', encoding='utf-8') as f:
     long_description = f.read()
@@ -12,11 +20,19 @@ setup(
     author="Your Name",
     author_email="your.email@example.com",
     url="https://github.com/yourusername/nn_graph",  # Replace with your repository URL
-    packages=find_packages(exclude=['tests']),
+    # The repository root is the nn_graph package itself
+    packages=['nn_graph'],
+    package_dir={'nn_graph': '.'},
+    ext_modules=ext_modules,
     install_requires=[
-        "matplotlib>=3.0",
-        "networkx>=2.0",
+        "matplotlib>=3.6",
+        "numpy>=1.15",
+        "orjson>=3.0",
     ],
+    extras_require={
+        "fast": ["numba"],
+        "streaming": ["ijson>=3.1"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
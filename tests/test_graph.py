@@ -0,0 +1,222 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import nn_graph.graph as graph
+from nn_graph.graph import SimpleNNNetworkGraph
+
+NETWORK = {
+    "TestNetwork": {
+        "input_sources": {"poisson": {"parameters": {"rate": 10}}},
+        "populations": {
+            "pop0": {"size": 5, "properties": {"color": "0.8 0 0"}},
+            "pop1": {"size": 10, "properties": {"color": "0 0 0.8 0.5"}},
+            "pop2": {"size": 3, "properties": {"color": "0 0.8 0"}}
+        },
+        "inputs": {"stim": {"input_source": "poisson", "population": "pop0"}},
+        "projections": {
+            "projA": {"presynaptic": "pop0", "postsynaptic": "pop1", "synapse": "ampaSyn", "weight": 1, "delay": 2},
+            "projB": {"presynaptic": "pop1", "postsynaptic": "pop0", "synapse": "gabaSyn",
+                      "random_connectivity": {"probability": 0.5}},
+            "projC": {"presynaptic": "pop2", "postsynaptic": "pop1", "synapse": "nmdaSyn", "delay": 3,
+                      "directionality": "bidirectional"}
+        }
+    }
+}
+
+
+class GraphTestCase(unittest.TestCase):
+    """Base test case that writes NETWORK to a temporary JSON file."""
+
+    def setUp(self):
+        fd, self.file_path = tempfile.mkstemp(suffix='.json')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(NETWORK, f)
+        self.addCleanup(os.remove, self.file_path)
+
+
+class TestEdgeCoordinates(GraphTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.graph = SimpleNNNetworkGraph(self.file_path)
+        rng = np.random.default_rng(0)
+        self.starts = rng.random((50, 2))
+        self.ends = rng.random((50, 2))
+        self.start_sizes = rng.random(50)
+        self.end_sizes = rng.random(50)
+
+    def _coordinates(self):
+        return self.graph._calculate_edge_coordinates(self.starts.copy(), self.ends.copy(),
+                                                      self.start_sizes, self.end_sizes)
+
+    def _numpy_coordinates(self):
+        with mock.patch.object(graph, '_edge_coords_kernel', False):
+            return self._coordinates()
+
+    def test_python_loop_matches_numpy(self):
+        out = np.empty((50, 4))
+        graph._edge_coords(self.starts, self.ends, self.start_sizes, self.end_sizes, out)
+        np.testing.assert_allclose(out, self._numpy_coordinates())
+
+    def test_numba_kernel_matches_numpy(self):
+        kernel = graph._get_edge_coords_kernel()
+        if not kernel:
+            self.skipTest("numba is not installed")
+        out = np.empty((50, 4))
+        kernel(self.starts, self.ends, self.start_sizes, self.end_sizes, out)
+        np.testing.assert_allclose(out, self._numpy_coordinates())
+
+    def test_small_graphs_do_not_load_numba(self):
+        with mock.patch.object(graph, '_edge_coords_kernel', None):
+            self._coordinates()
+            self.assertIsNone(graph._edge_coords_kernel)
+
+    def test_large_graphs_use_numba_kernel(self):
+        kernel = graph._get_edge_coords_kernel()
+        if not kernel:
+            self.skipTest("numba is not installed")
+        expected = self._numpy_coordinates()
+        spy = mock.Mock(wraps=kernel)
+        with mock.patch.object(graph, '_NUMBA_MIN_EDGES', 50), mock.patch.object(graph, '_edge_coords_kernel', spy):
+            np.testing.assert_allclose(self._coordinates(), expected)
+        spy.assert_called_once()
+
+
+class TestArrowheadVertices(GraphTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.graph = SimpleNNNetworkGraph(self.file_path)
+
+    def test_horizontal_edge(self):
+        heads = self.graph._calculate_arrowhead_vertices(np.array([[0.0, 0.0, 2.0, 0.0]]), 4.0, 2.0)
+        np.testing.assert_allclose(heads[0], [[-4.0, 2.0], [0.0, 0.0], [-4.0, -2.0]])
+
+    def test_diagonal_edge(self):
+        heads = self.graph._calculate_arrowhead_vertices(np.array([[1.0, 1.0, 4.0, 5.0]]), 5.0, 1.5)
+        left, tip, right = heads[0]
+        np.testing.assert_allclose(tip, [0.0, 0.0])
+        np.testing.assert_allclose((left + right) / 2, [-3.0, -4.0])
+        np.testing.assert_allclose(np.hypot(*(left - right)) / 2, 1.5)
+
+    def test_heads_keep_their_size_when_zoomed(self):
+        from matplotlib.collections import PathCollection
+        from matplotlib.figure import Figure
+
+        fig = Figure(dpi=100)
+        self.graph._draw_figure(fig)
+        ax = fig.axes[0]
+        heads = next(c for c in ax.collections if isinstance(c, PathCollection) and c.get_paths())
+        size = np.ptp(heads.get_transform().transform(heads.get_paths()[0].vertices), axis=0)
+
+        ax.set_xlim(ax.get_xlim()[0], ax.get_xlim()[1] * 4)
+        fig.set_size_inches(20, 10)
+        np.testing.assert_allclose(np.ptp(heads.get_transform().transform(heads.get_paths()[0].vertices), axis=0),
+                                   size)
+
+
+class TestRender(GraphTestCase):
+
+    def test_render_writes_png_without_pyplot(self):
+        pyplot_loaded = 'matplotlib.pyplot' in sys.modules
+        g = SimpleNNNetworkGraph(self.file_path)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = g.render(os.path.join(tmp, 'graph.png'))
+
+            self.assertTrue(os.path.isfile(path))
+            self.assertGreater(os.path.getsize(path), 0)
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(8), b'\x89PNG\r\n\x1a\n')
+        self.assertEqual('matplotlib.pyplot' in sys.modules, pyplot_loaded)
+
+
+class TestStreamedLoading(GraphTestCase):
+
+    def setUp(self):
+        if graph.ijson is None:
+            self.skipTest("ijson is not installed")
+        super().setUp()
+
+    def _write_network(self, network):
+        with open(self.file_path, 'w') as f:
+            json.dump({'TestNetwork': network}, f)
+
+    def _load_streamed(self):
+        with mock.patch.object(graph, '_STREAMING_THRESHOLD', 0):
+            return SimpleNNNetworkGraph(self.file_path)
+
+    def _assert_streamed_matches_in_memory(self):
+        in_memory = SimpleNNNetworkGraph(self.file_path)
+        streamed = self._load_streamed()
+
+        self.assertIsInstance(streamed.network_data['TestNetwork']['projections'], graph._StreamedSection)
+        self.assertEqual(streamed.G.nodes, in_memory.G.nodes)
+        self.assertEqual(streamed.G.edges, in_memory.G.edges)
+
+    def _assert_both_raise_key_error(self, missing):
+        self._write_network({key: value for key, value in NETWORK['TestNetwork'].items() if key != missing})
+        with self.assertRaises(KeyError):
+            SimpleNNNetworkGraph(self.file_path)
+        with self.assertRaises(KeyError):
+            self._load_streamed()
+
+    def test_streamed_graph_matches_in_memory_graph(self):
+        self._assert_streamed_matches_in_memory()
+
+    def test_streamed_graph_with_projections_first(self):
+        network = NETWORK['TestNetwork']
+        reordered = {'projections': network['projections']}
+        reordered.update((key, value) for key, value in network.items() if key != 'projections')
+        self._write_network(reordered)
+        self._assert_streamed_matches_in_memory()
+
+    def test_streamed_graph_without_inputs(self):
+        self._write_network({key: value for key, value in NETWORK['TestNetwork'].items() if key != 'inputs'})
+        self._assert_streamed_matches_in_memory()
+
+    def test_missing_input_sources_raises(self):
+        self._assert_both_raise_key_error('input_sources')
+
+    def test_missing_populations_raises(self):
+        self._assert_both_raise_key_error('populations')
+
+    def test_missing_projections_raises(self):
+        self._assert_both_raise_key_error('projections')
+
+
+class TestCompiledEdgeLoop(GraphTestCase):
+
+    def setUp(self):
+        if graph.collect_edge_artists is None:
+            self.skipTest("the nn_graph._draw extension is not built")
+        super().setUp()
+
+    def _labels(self, ax):
+        return [(text.get_position(), text.get_text()) for text in ax.texts]
+
+    def test_compiled_loop_matches_python_loop(self):
+        from matplotlib.figure import Figure
+
+        g = SimpleNNNetworkGraph(self.file_path)
+        pos = g.set_node_positions()
+        edges = list(g.G.edges)
+        coords = g._calculate_edge_coordinates(np.array([pos[u] for u, _ in edges], dtype=float),
+                                               np.array([pos[v] for _, v in edges], dtype=float),
+                                               np.full(len(edges), 0.2), np.full(len(edges), 0.3))
+
+        python_ax = Figure().add_subplot()
+        compiled_ax = Figure().add_subplot()
+        expected = g._collect_edge_artists(python_ax, coords)
+        result = graph.collect_edge_artists(compiled_ax, list(g.G.edges.items()), g._node_shape, coords)
+
+        self.assertEqual(result, expected)
+        self.assertEqual(self._labels(compiled_ax), self._labels(python_ax))
+
+if __name__ == '__main__':
+    unittest.main()